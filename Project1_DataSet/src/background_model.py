@@ -1,9 +1,18 @@
 import numpy as np
 
-def build_background_model(df):
-    if df is None or df.empty:
+def build_background_model(frames):
+    if frames is None or len(frames) == 0:
         raise ValueError("Background data is empty or invalid.")
-    frames = np.stack(df['gridEye_array'])
-    background = np.median(frames, axis=0)  # Robust to outliers
+    background = _median_axis0(frames).astype(np.float32, copy=False)  # Robust to outliers
     print(f"[INFO] Background model created successfully from {frames.shape[0]} frames.")
     return background
+
+def _median_axis0(frames):
+    """Per-pixel median using introselect (np.partition) instead of a full sort."""
+    n = frames.shape[0]
+    k = n // 2
+    if n % 2:
+        return np.partition(frames, k, axis=0)[k]
+    # Even count: one partition places both middle order statistics
+    part = np.partition(frames, (k - 1, k), axis=0)
+    return (part[k - 1] + part[k]) / 2
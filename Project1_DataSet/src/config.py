@@ -14,6 +14,8 @@ START_FRAME = 500          # We will only sample frames *after* this one.
 
 # --- 💡 NEW: Random Sampling ---
 NUM_RANDOM_SAMPLES = 10    # The number of random frames to select and process.
+VISUALIZATION_WORKERS = 2  # Background threads that encode and write the PNGs.
+FILE_WORKERS = 2           # Processes that load the data files in parallel.
 
 # --- People Counting Parameters ---
 TEMPERATURE_THRESHOLD = 1.2
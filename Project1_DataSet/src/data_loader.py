@@ -1,21 +1,88 @@
 # src/data_loader.py
 
+import os
 import pandas as pd
 import numpy as np
 
+CACHE_VERSION = 1  # Bump whenever the cache layout changes; older caches are re-parsed
+
 def load_data(filename):
     """
     Loads and parses Grid-EYE sensor data from an XLSX file.
     Now only loads columns that are strictly necessary.
+
+    Returns a (frames, timestamps) tuple of plain NumPy arrays: frames is a
+    contiguous (N, 8, 8) float32 array holding one sensor frame per row, and
+    timestamps holds the matching datetime64[us] timestamps.
+
+    The parsed data is cached next to the XLSX file as '<filename>.npz',
+    and later runs read the cache instead while it is newer than the source
+    and was written with the current CACHE_VERSION.
     """
+    cache = filename + '.npz'
     try:
+        if _cache_is_fresh(filename, cache):
+            cached = _load_cache(cache)
+            if cached is not None:
+                return cached
+
         # We don't need 'current_people_count' anymore.
         df = pd.read_excel(filename, usecols=['gridEye_array', 'timestamp'])
-        df['gridEye_array'] = df['gridEye_array'].apply(lambda x: np.array(eval(x))) #converts string to list
-        return df
+        frames = _parse_frames(df['gridEye_array'].to_numpy())
+        timestamps = pd.to_datetime(df['timestamp']).to_numpy().astype('datetime64[us]')
+        _save_cache(cache, frames, timestamps)
+        return frames, timestamps
     except FileNotFoundError:
         print(f"Error: The file '{filename}' was not found.")
-        return None
+        return None, None
     except ValueError as e:
         print(f"Error reading {filename}: {e}. Ensure it contains the required columns.")
-        return None
\ No newline at end of file
+        return None, None
+
+def _parse_frames(raw):
+    """
+    Parses the "[27.0, 28.0, ...]" strings into an (N, 8, 8) float32 array.
+    All rows are joined and handed to one np.fromstring call, so nothing is
+    eval'd and no per-row array is created.
+    """
+    if len(raw) == 0:
+        return np.empty((0, 8, 8), dtype=np.float32)
+    values = np.fromstring(','.join(s.strip()[1:-1] for s in raw), sep=',', dtype=np.float32)
+    if values.size != len(raw) * 64:
+        raise ValueError(f"expected 64 gridEye_array values per row, got {values.size} over {len(raw)} rows")
+    return values.reshape(-1, 8, 8)
+
+def _cache_is_fresh(filename, cache):
+    """Checks whether the NPZ cache exists and is not older than its source file."""
+    return os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(filename)
+
+def _load_cache(cache):
+    """
+    Reads a cache written by _save_cache back into a (frames, timestamps) tuple.
+    Returns None if the cache was written with a different CACHE_VERSION.
+    """
+    with np.load(cache) as data:
+        if 'version' not in data or data['version'] != CACHE_VERSION:
+            return None
+        if 'frames_q' in data:
+            frames = data['frames_q'].astype(np.float32)
+            frames *= 0.25  # quarter-degree steps back to degrees C
+        else:
+            frames = data['frames']
+        return frames, data['timestamps']
+
+def _save_cache(cache, frames, timestamps):
+    """
+    Writes the parsed frames and timestamps; a failed write only costs speed.
+    Grid-EYE readings come in 0.25C steps, so frames on that grid are stored
+    losslessly as int16 quarter-degrees instead of float32.
+    """
+    frames_q = np.round(frames * 4).astype(np.int16)
+    if np.array_equal(frames_q * np.float32(0.25), frames):
+        arrays = {'frames_q': frames_q}
+    else:
+        arrays = {'frames': frames}
+    try:
+        np.savez_compressed(cache, version=CACHE_VERSION, timestamps=timestamps, **arrays)
+    except OSError as e:
+        print(f"Warning: could not write cache '{cache}': {e}")
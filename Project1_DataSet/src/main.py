@@ -4,6 +4,8 @@ import os
 import sys
 import numpy as np
 import shutil # Import the shutil library for directory operations
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
 
 #  Add the project root to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -15,6 +17,62 @@ from src import data_loader
 from src import people_counter
 from src import visualization
 
+def process_file(filepath, frames, timestamps, actual_count, background_profile):
+    """
+    Counts people in random frames of one loaded data file and saves their visualizations.
+    Returns the background profile adapted with the file's no-person frames.
+    """
+    filename = os.path.basename(filepath)
+    print(f"Processing file: {filename} (Actual Count: {actual_count})")
+    
+    if frames is None:
+        return background_profile
+
+    output_subdir = os.path.join(config.OUTPUTS_DIR, os.path.splitext(filename)[0])
+    utils.ensure_dir_exists(output_subdir)
+    
+    num_eligible = max(len(frames) - config.START_FRAME, 0)
+    
+    if num_eligible < config.NUM_RANDOM_SAMPLES:
+        print(f"  -> Skipping {filename}, not enough frames ({num_eligible}) to sample {config.NUM_RANDOM_SAMPLES} random cases.")
+        return background_profile
+    
+    # Sample row indices directly instead of copying DataFrame rows
+    rng = np.random.default_rng()
+    indices = rng.choice(num_eligible, size=config.NUM_RANDOM_SAMPLES, replace=False) + config.START_FRAME
+    print(f"  -> {filename}: processing {config.NUM_RANDOM_SAMPLES} random frames (from frame {config.START_FRAME} onwards)...")
+
+    # Count all sampled frames in one batched pass against the current background
+    counts, raw_frames, fgs, blobs = people_counter.count_people_batch(frames[indices], background_profile)
+
+    # Fold every no-person frame into the background in one closed-form update
+    no_person = counts == 0
+    background_profile = people_counter.adapt_background(
+        background_profile, frames[indices[no_person]], config.ADAPTIVE_BG_RATE)
+
+    # PNG encoding and disk writes overlap each other on a small thread pool
+    with ThreadPoolExecutor(max_workers=config.VISUALIZATION_WORKERS) as pool:
+        pending_saves = [
+            pool.submit(
+                visualization.save_visualization,
+                output_dir=output_subdir,
+                frame_number=index,
+                frame=raw_frame,
+                foreground=fg,
+                final_blobs=final_blobs,
+                est_count=int(est_count),
+                actual_count=actual_count,
+                timestamp=timestamp
+            )
+            for index, timestamp, raw_frame, fg, final_blobs, est_count in zip(
+                indices, timestamps[indices], raw_frames, fgs, blobs, counts)
+        ]
+    for future in pending_saves:
+        future.result()  # Re-raise any error from a background save
+        
+    print(f"  -> Finished processing {filename}. {config.NUM_RANDOM_SAMPLES} visualizations saved in: {output_subdir}")
+    return background_profile
+
 def main():
     """Main function to orchestrate the people counting process."""
     
@@ -27,8 +85,8 @@ def main():
     utils.ensure_dir_exists(config.OUTPUTS_DIR)
     
     print("Calculating initial background temperature...")
-    df_0_person = data_loader.load_data(config.FILE_0_PERSON)
-    background_profile = people_counter.calculate_initial_background(df_0_person)
+    frames_0_person, _ = data_loader.load_data(config.FILE_0_PERSON)
+    background_profile = people_counter.calculate_initial_background(frames_0_person)
 
     if background_profile is None:
         print("Could not calculate background. Exiting.")
@@ -42,48 +100,15 @@ def main():
         (config.FILE_2_PERSON, 2)
     ]
 
-    for filepath, actual_count in datasets_to_process:
-        filename = os.path.basename(filepath)
-        print(f"Processing file: {filename} (Actual Count: {actual_count})")
-        
-        df = data_loader.load_data(filepath)
-        if df is None:
-            continue
+    # XLSX parsing holds the GIL, so the files are loaded in parallel worker processes
+    filepaths = [filepath for filepath, _ in datasets_to_process]
+    with mp.Pool(processes=min(config.FILE_WORKERS, len(filepaths))) as pool:
+        loaded = pool.map(data_loader.load_data, filepaths)
 
-        output_subdir = os.path.join(config.OUTPUTS_DIR, os.path.splitext(filename)[0])
-        utils.ensure_dir_exists(output_subdir)
-        
-        eligible_frames = df.iloc[config.START_FRAME:]
-        
-        if len(eligible_frames) < config.NUM_RANDOM_SAMPLES:
-            print(f"  -> Skipping {filename}, not enough frames ({len(eligible_frames)}) to sample {config.NUM_RANDOM_SAMPLES} random cases.")
-            continue
-        
-        df_to_process = eligible_frames.sample(n=config.NUM_RANDOM_SAMPLES)
-        print(f"  -> Processing {config.NUM_RANDOM_SAMPLES} random frames (from frame {config.START_FRAME} onwards)...")
-
-        for index, row in df_to_process.iterrows():
-            frame = row['gridEye_array']
-            timestamp = row['timestamp']
-            
-            est_count, raw_frame, fg, final_blobs = people_counter.count_people(frame, background_profile)
-
-            if est_count == 0:
-                background_profile = (1 - config.ADAPTIVE_BG_RATE) * background_profile + (config.ADAPTIVE_BG_RATE * frame)
-
-            visualization.save_visualization(
-                output_dir=output_subdir,
-                frame_number=index,
-                frame=raw_frame,
-                foreground=fg,
-                final_blobs=final_blobs,
-                est_count=est_count,
-                actual_count=actual_count,
-                timestamp=timestamp
-            )
-            
-        print(f"  -> Finished processing. {config.NUM_RANDOM_SAMPLES} visualizations saved in: {output_subdir}")
-        print("-" * 30)
+    # Counting stays sequential: each file starts from the background adapted by the previous one
+    for (filepath, actual_count), (frames, timestamps) in zip(datasets_to_process, loaded):
+        background_profile = process_file(filepath, frames, timestamps, actual_count, background_profile)
+    print("-" * 30)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
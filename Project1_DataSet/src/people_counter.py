@@ -1,35 +1,185 @@
 # src/people_counter.py
 
 import numpy as np
-from scipy.ndimage import label, binary_erosion, binary_dilation, generate_binary_structure
+from numba import njit, prange
 from . import config
 
-def calculate_initial_background(df_no_person):
-    """Calculates the initial background temperature from the 0-person data."""
-    if df_no_person is None:
+# An 8x8 mask packs into one uint64: pixel (r, c) is bit 63 - (8*r + c),
+# the order np.unpackbits expects when the value is read big-endian.
+_NOT_COL_0 = np.uint64(0x7F7F7F7F7F7F7F7F)  # clears the first column of every row
+_NOT_COL_7 = np.uint64(0xFEFEFEFEFEFEFEFE)  # clears the last column of every row
+
+# Single-bit mask of every pixel in raster order, hoisted so the kernels index
+# it instead of rebuilding a shift per pixel (numba freezes it as a constant).
+_PIXEL_BITS = np.left_shift(np.uint64(1), np.arange(63, -1, -1, dtype=np.uint64))
+
+def calculate_initial_background(frames_no_person):
+    """Calculates the initial background temperature from the 0-person frames."""
+    if frames_no_person is None:
         return None
-    return np.mean(np.stack(df_no_person['gridEye_array']), axis=0)
+    # Accumulate in float64 for accuracy, but keep the profile float32 like the frames
+    return np.mean(frames_no_person, axis=0, dtype=np.float64).astype(np.float32)
+
+def adapt_background(background, frames, rate):
+    """Folds a sequence of no-person frames into the background profile.
+
+    Equivalent to applying background = (1 - rate) * background + rate * frame
+    for each frame in order, but computed in closed form as one weighted sum.
+    """
+    k = len(frames)
+    if k == 0:
+        return background
+    decay = 1.0 - rate
+    weights = rate * decay ** np.arange(k - 1, -1, -1)  # oldest frame decays most
+    return (decay ** k * background + np.tensordot(weights, frames, axes=1)).astype(np.float32)
 
 def count_people(frame, background):
-    """Counts people in a single thermal frame using advanced techniques."""
-    frame_grid = frame.reshape(8, 8)
-    background_grid = background.reshape(8, 8)
-
-    foreground = (frame_grid - background_grid) > config.TEMPERATURE_THRESHOLD
-
-    struct = generate_binary_structure(2, 1)
-    eroded = binary_erosion(foreground, structure=struct, iterations=config.EROSION_ITERATIONS)
-    dilated = binary_dilation(eroded, structure=struct, iterations=config.DILATION_ITERATIONS)
-
-    labeled_array, num_features = label(dilated)
-
-    people_count = 0
-    valid_labels = []
-    for i in range(1, num_features + 1):
-        blob_size = np.sum(labeled_array == i)
-        if config.MIN_BLOB_SIZE <= blob_size <= config.MAX_BLOB_SIZE:
-            people_count += 1
-            valid_labels.append(i)
-            
-    final_blobs = np.isin(labeled_array, valid_labels)
-    return people_count, frame_grid, foreground, final_blobs
\ No newline at end of file
+    """Counts people in a single 8x8 thermal frame using advanced techniques."""
+    count, fg_bits, blob_bits = count_people_packed(
+        frame.ravel(), background.ravel(), *_counting_params())
+    foreground, final_blobs = _unpack_masks(np.array([fg_bits, blob_bits], dtype=np.uint64))
+    return int(count), frame, foreground, final_blobs
+
+def count_people_batch(frames, background):
+    """Counts people in an (N, 8, 8) stack of frames in one compiled pass.
+
+    Every frame is compared against the same background. Returns the per-frame
+    counts together with the frames, foregrounds and final blobs.
+    """
+    counts, fg_bits, blob_bits = _count_people_packed_batch(
+        frames.reshape(-1, 64), background.ravel(), *_counting_params())
+    return counts, frames, _unpack_masks(fg_bits), _unpack_masks(blob_bits)
+
+def _counting_params():
+    """Config values in the argument order of count_people_packed."""
+    # The threshold is float32 so the kernel compares exactly like NumPy does
+    return (np.float32(config.TEMPERATURE_THRESHOLD),
+            config.EROSION_ITERATIONS, config.DILATION_ITERATIONS,
+            config.MIN_BLOB_SIZE, config.MAX_BLOB_SIZE)
+
+def _unpack_masks(bits):
+    """Unpacks N uint64 values back into an (N, 8, 8) boolean stack."""
+    packed = bits.astype('>u8').view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(packed, axis=1).reshape(-1, 8, 8).astype(bool)
+
+@njit(cache=True)
+def _neighbours(bits):
+    """Returns the packed left, right, upper and lower 4-neighbours of every pixel.
+
+    Pixels outside the grid read as 0, matching scipy's default border_value.
+    """
+    left = (bits >> 1) & _NOT_COL_0
+    right = (bits << 1) & _NOT_COL_7
+    up = bits >> 8
+    down = bits << 8
+    return left, right, up, down
+
+@njit(cache=True)
+def _erode(bits):
+    """One binary erosion step with the 4-connected cross structuring element."""
+    left, right, up, down = _neighbours(bits)
+    return bits & left & right & up & down
+
+@njit(cache=True)
+def _dilate(bits):
+    """One binary dilation step with the 4-connected cross structuring element."""
+    left, right, up, down = _neighbours(bits)
+    return bits | left | right | up | down
+
+@njit(cache=True)
+def _find(parent, p):
+    """Union-find root lookup with path halving."""
+    while parent[p] != p:
+        parent[p] = parent[parent[p]]
+        p = parent[p]
+    return p
+
+@njit(cache=True)
+def _label_packed(bits):
+    """4-connected component labelling of a packed 8x8 mask.
+
+    Returns a flat int8[64] label array and the number of components. Labels
+    are numbered in raster order of each component's first pixel, the same
+    numbering scipy.ndimage.label produces.
+    """
+    parent = np.empty(64, dtype=np.int8)
+    for p in range(64):
+        if not bits & _PIXEL_BITS[p]:
+            parent[p] = -1
+            continue
+        parent[p] = p
+        # Union with the left and upper neighbours; the lower index stays root
+        for q in (p - 1, p - 8):
+            if q < 0 or (q == p - 1 and p % 8 == 0) or parent[q] < 0:
+                continue
+            rq = _find(parent, q)
+            rp = _find(parent, p)
+            if rq != rp:
+                parent[max(rq, rp)] = min(rq, rp)
+
+    labels = np.zeros(64, dtype=np.int8)
+    n = 0
+    for p in range(64):
+        if parent[p] < 0:
+            continue
+        root = _find(parent, p)
+        if root == p:
+            n += 1
+            labels[p] = n
+        else:
+            labels[p] = labels[root]
+    return labels, n
+
+@njit(cache=True)
+def count_people_packed(frame, background, threshold, erosions, dilations, min_size, max_size):
+    """Thresholding, morphology, labelling and blob filtering for one frame.
+
+    frame and background are flat float32[64] arrays. Returns the people count,
+    the packed foreground mask and the packed mask of the blobs that passed the
+    size filter; everything in between stays in a few uint64 registers.
+    """
+    fg = np.uint64(0)
+    for p in range(64):
+        if frame[p] - background[p] > threshold:
+            fg |= _PIXEL_BITS[p]
+    if fg == 0:
+        return 0, fg, fg  # empty frame: skip morphology and labelling
+
+    b = fg
+    for _ in range(erosions):
+        b = _erode(b)
+    for _ in range(dilations):
+        b = _dilate(b)
+    if b == 0:
+        return 0, fg, b
+
+    labels, num = _label_packed(b)
+    sizes = np.zeros(num + 1, dtype=np.int64)
+    for p in range(64):
+        sizes[labels[p]] += 1
+
+    count = 0
+    for k in range(1, num + 1):
+        if min_size <= sizes[k] <= max_size:
+            count += 1
+    kept = np.uint64(0)
+    for p in range(64):
+        k = labels[p]
+        if k > 0 and min_size <= sizes[k] <= max_size:
+            kept |= _PIXEL_BITS[p]
+    return count, fg, kept
+
+@njit(parallel=True, cache=True)
+def _count_people_packed_batch(frames, background, threshold, erosions, dilations, min_size, max_size):
+    """Runs count_people_packed over the rows of an (N, 64) stack in parallel."""
+    n = frames.shape[0]
+    counts = np.zeros(n, dtype=np.int64)
+    fg_bits = np.zeros(n, dtype=np.uint64)
+    blob_bits = np.zeros(n, dtype=np.uint64)
+    for i in prange(n):
+        count, fg, kept = count_people_packed(
+            frames[i], background, threshold, erosions, dilations, min_size, max_size)
+        counts[i] = count
+        fg_bits[i] = fg
+        blob_bits[i] = kept
+    return counts, fg_bits, blob_bits
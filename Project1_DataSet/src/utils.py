@@ -3,7 +3,9 @@
 import os
 
 def ensure_dir_exists(directory_path):
-    """Checks if a directory exists, and if not, creates it."""
-    if not os.path.exists(directory_path):
+    """Creates a directory (and its parents) unless it already exists."""
+    try:
         os.makedirs(directory_path)
-        print(f"Created directory: {directory_path}")
\ No newline at end of file
+    except FileExistsError:
+        return
+    print(f"Created directory: {directory_path}")
@@ -1,34 +1,65 @@
 # src/visualization.py
 
-import matplotlib.pyplot as plt
+import cv2
+import numpy as np
 import os
 
+# --- Layout (pixels) ---
+TILE_SIZE = 240        # Each 8x8 grid is upscaled to TILE_SIZE x TILE_SIZE
+MARGIN = 30            # Horizontal padding around each tile
+TITLE_HEIGHT = 30
+HEADER_HEIGHT = 40
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# --- Raw temperature display range (degrees C) ---
+TEMP_MIN = 25
+TEMP_MAX = 35
+
+def _colormap_lut(colormap):
+    """Returns the 256-entry BGR lookup table of an OpenCV colormap."""
+    ramp = np.arange(256, dtype=np.uint8).reshape(256, 1)
+    return cv2.applyColorMap(ramp, colormap).reshape(256, 3)
+
+# Built once at import; indexing into them replaces per-frame colormapping.
+INFERNO_LUT = _colormap_lut(cv2.COLORMAP_INFERNO)
+VIRIDIS_LUT = _colormap_lut(cv2.COLORMAP_VIRIDIS)
+GRAY_LUT = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+
+def _put_centered(image, text, y, scale):
+    """Draws black text horizontally centered on the image at baseline y."""
+    (width, _), _ = cv2.getTextSize(text, FONT, scale, 1)
+    x = max(0, (image.shape[1] - width) // 2)
+    cv2.putText(image, text, (x, y), FONT, scale, (0, 0, 0), 1, cv2.LINE_AA)
+
+def _panel(title, tile):
+    """Upscales an 8x8 BGR tile and frames it with a title band."""
+    tile = cv2.resize(tile, (TILE_SIZE, TILE_SIZE), interpolation=cv2.INTER_NEAREST)
+    panel = np.full((TITLE_HEIGHT + TILE_SIZE + MARGIN, TILE_SIZE + 2 * MARGIN, 3), 255, np.uint8)
+    panel[TITLE_HEIGHT:TITLE_HEIGHT + TILE_SIZE, MARGIN:MARGIN + TILE_SIZE] = tile
+    _put_centered(panel, title, TITLE_HEIGHT - 10, 0.45)
+    return panel
+
 def save_visualization(output_dir, frame_number, frame, foreground, final_blobs, est_count, actual_count, timestamp):
     """
     Saves the visualization of a single frame to a file.
     """
-    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
-    fig.suptitle(f'Timestamp: {timestamp}')
-
     # 1. Raw Thermal Data
-    im1 = axes[0].imshow(frame, cmap='inferno', vmin=25, vmax=35)
-    axes[0].set_title('Raw Thermal Data')
-    fig.colorbar(im1, ax=axes[0])
+    norm = np.clip((frame - TEMP_MIN) * (255.0 / (TEMP_MAX - TEMP_MIN)), 0, 255).astype(np.uint8)
+    raw_panel = _panel(f'Raw Thermal Data ({TEMP_MIN}-{TEMP_MAX}C)', INFERNO_LUT[norm])
 
     # 2. Foreground
-    axes[1].imshow(foreground, cmap='gray')
-    axes[1].set_title('Foreground')
+    fg_panel = _panel('Foreground', GRAY_LUT[foreground.astype(np.uint8) * 255])
 
     # 3. Final Detections
-    axes[2].imshow(final_blobs, cmap='viridis')
-    axes[2].set_title(f'Detected People: {est_count} (Actual: {actual_count})')
+    blobs_panel = _panel(f'Detected People: {est_count} (Actual: {actual_count})',
+                         VIRIDIS_LUT[final_blobs.astype(np.uint8) * 255])
+
+    body = np.hstack([raw_panel, fg_panel, blobs_panel])
+    header = np.full((HEADER_HEIGHT, body.shape[1], 3), 255, np.uint8)
+    stamp = np.datetime_as_string(timestamp, unit='us').replace('T', ' ')
+    _put_centered(header, f'Timestamp: {stamp}', HEADER_HEIGHT - 12, 0.6)
 
-    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-    
-    # Save the figure to a file
+    # Save the image to a file
     file_name = f"frame_{frame_number:04d}.png"
     output_path = os.path.join(output_dir, file_name)
-    plt.savefig(output_path)
-    
-    # Close the plot to free up memory
-    plt.close(fig)
\ No newline at end of file
+    cv2.imwrite(output_path, np.vstack([header, body]))
@@ -5,10 +5,11 @@ from sensor_interface import GridEyeSensor
 
 def build_background():
     sensor = GridEyeSensor()
-    frames = []
     print("[INFO] Building background model...")
-    for _ in range(BG_FRAMES):
-        frames.append(sensor.read_frame())
-    bg = np.mean(frames, axis=0)
+    # Running sum instead of stacking every frame; same result as np.mean
+    bg = sensor.read_frame().astype(np.float64)
+    for _ in range(BG_FRAMES - 1):
+        bg += sensor.read_frame()
+    bg /= BG_FRAMES
     print("[INFO] Background model built successfully.")
     return bg
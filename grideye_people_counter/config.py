@@ -17,3 +17,4 @@ DIRECTION_SMOOTH = 4      # frames to confirm motion direction
 
 # Debug / Logging
 DEBUG = True
+HEADLESS = False          # skip the live display (counting only)
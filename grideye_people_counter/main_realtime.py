@@ -7,7 +7,7 @@ from people_counter import detect_people
 from motion_tracker import MotionTracker
 from visualization import visualize
 from utils import smooth_background
-from config import FRAME_INTERVAL
+from config import FRAME_INTERVAL, HEADLESS
 
 def main():
     bg = build_background()
@@ -19,8 +19,9 @@ def main():
         frame = sensor.read_frame()
         blobs, mask = detect_people(frame, bg)
         inside = tracker.update(blobs)
-        visualize(frame, mask, blobs, inside)
-        bg = smooth_background(bg, frame)
+        if not HEADLESS:
+            visualize(frame, mask, blobs, inside)
+        smooth_background(bg, frame, out=bg)
 
         print(f"[INFO] People inside: {inside}")
         time.sleep(FRAME_INTERVAL)
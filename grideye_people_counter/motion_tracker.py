@@ -16,16 +16,23 @@ class MotionTracker:
             return self.people_inside
 
         prev, curr = self.buffer[-2], self.buffer[-1]
-        for (x1, y1) in prev:
-            closest = min(curr, key=lambda c: np.hypot(c[0]-x1, c[1]-y1)) if curr else None
-            if closest:
-                x2, y2 = closest
-                dx = x2 - x1
-                if abs(dx) > 1:
-                    if dx > 0 and x1 < ENTRY_LINE_X <= x2:
-                        self.people_inside += 1
-                        self.entry_events.append("IN")
-                    elif dx < 0 and x1 > ENTRY_LINE_X >= x2 and self.people_inside > 0:
-                        self.people_inside -= 1
-                        self.exit_events.append("OUT")
+        if not prev or not curr:
+            return self.people_inside
+
+        # Nearest current blob for every previous blob in one distance matrix
+        p = np.asarray(prev)
+        c = np.asarray(curr)
+        dist2 = ((p[:, None, :] - c[None, :, :]) ** 2).sum(axis=2)
+        closest = dist2.argmin(axis=1)
+
+        for (x1, y1), j in zip(prev, closest.tolist()):
+            x2, y2 = curr[j]
+            dx = x2 - x1
+            if abs(dx) > 1:
+                if dx > 0 and x1 < ENTRY_LINE_X <= x2:
+                    self.people_inside += 1
+                    self.entry_events.append("IN")
+                elif dx < 0 and x1 > ENTRY_LINE_X >= x2 and self.people_inside > 0:
+                    self.people_inside -= 1
+                    self.exit_events.append("OUT")
         return self.people_inside
@@ -1,20 +1,156 @@
 # people_counter.py
 import numpy as np
-import cv2
+from numba import njit
 from config import TEMP_THRESHOLD, MIN_BLOB_SIZE, MAX_BLOB_SIZE
 
+
+@njit(cache=True)
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+@njit(cache=True)
+def _union(parent, a, b):
+    ra = _find(parent, a)
+    rb = _find(parent, b)
+    if ra < rb:
+        parent[rb] = ra
+    elif rb < ra:
+        parent[ra] = rb
+
+
+@njit(cache=True)
+def _detect_blobs(frame, bg, threshold, min_size, max_size):
+    """
+    Threshold, label and size-filter in one kernel, without tracing contours.
+
+    Returns the same mask and blob centroids, in the same order, as
+    cv2.findContours(RETR_EXTERNAL) followed by cv2.contourArea and
+    cv2.moments on each contour (see test_people_counter.py):
+
+    - OpenCV traces foreground as 8-connected, so background is 4-connected.
+      Background not 4-connected to the border is a hole, and RETR_EXTERNAL
+      drops hole contours while the outer polygon's area still covers them.
+      A 4-connected flood fill from the border therefore marks exactly the
+      pixels outside every external contour.
+    - Each 8-connected group of remaining pixels is one external contour,
+      found with union-find.
+    - contourArea and moments integrate the polygon through boundary pixel
+      centres. That region splits into 2x2 windows of centres: 4 inside is
+      a unit square, 3 inside is a half-square triangle, fewer adds nothing.
+      A triangle's m10 is sx / 6, so sums are kept in sixths as integers.
+    - Blobs are emitted in reverse raster order of their top-left pixel,
+      which is the order findContours returns external contours in.
+    """
+    rows, cols = frame.shape
+    n_pix = rows * cols
+
+    mask = np.zeros((rows, cols), np.uint8)
+    for r in range(rows):
+        for c in range(cols):
+            if frame[r, c] - bg[r, c] > threshold:
+                mask[r, c] = 255
+
+    # Background 4-connected to the border is outside every blob; the rest
+    # is blob pixels plus their holes, as an external contour encloses them.
+    outside = np.zeros((rows, cols), np.bool_)
+    stack = np.empty(n_pix, np.int64)
+    top = 0
+    for r in range(rows):
+        for c in range(cols):
+            if (r == 0 or c == 0 or r == rows - 1 or c == cols - 1) and mask[r, c] == 0:
+                outside[r, c] = True
+                stack[top] = r * cols + c
+                top += 1
+    while top > 0:
+        top -= 1
+        r = stack[top] // cols
+        c = stack[top] % cols
+        for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            rr = r + dr
+            cc = c + dc
+            if 0 <= rr < rows and 0 <= cc < cols and mask[rr, cc] == 0 and not outside[rr, cc]:
+                outside[rr, cc] = True
+                stack[top] = rr * cols + cc
+                top += 1
+
+    # 8-connected union-find over the filled blobs
+    parent = np.arange(n_pix)
+    for r in range(rows):
+        for c in range(cols):
+            if outside[r, c]:
+                continue
+            i = r * cols + c
+            if c > 0 and not outside[r, c - 1]:
+                _union(parent, i, i - 1)
+            if r > 0:
+                for dc in (-1, 0, 1):
+                    cc = c + dc
+                    if 0 <= cc < cols and not outside[r - 1, cc]:
+                        _union(parent, i, i - cols + dc)
+
+    root_label = np.zeros(n_pix, np.int64)
+    n = 0
+    for i in range(n_pix):
+        if not outside[i // cols, i % cols]:
+            root = _find(parent, i)
+            if root_label[root] == 0:
+                n += 1
+                root_label[root] = n
+
+    # The contour polygon joins boundary pixel centres, so each 2x2 window
+    # of centres contributes a unit square (4 inside) or a triangle (3 inside).
+    # Sums are kept in sixths so they stay exact integers.
+    area6 = np.zeros(n, np.int64)
+    m10_6 = np.zeros(n, np.int64)
+    m01_6 = np.zeros(n, np.int64)
+    for r in range(rows - 1):
+        for c in range(cols - 1):
+            inside = 0
+            sx = 0
+            sy = 0
+            i = -1
+            for dr in (0, 1):
+                for dc in (0, 1):
+                    if not outside[r + dr, c + dc]:
+                        inside += 1
+                        sx += c + dc
+                        sy += r + dr
+                        i = (r + dr) * cols + c + dc
+            if inside < 3:
+                continue
+            k = root_label[_find(parent, i)] - 1
+            if inside == 4:
+                area6[k] += 6
+                m10_6[k] += 6 * c + 3
+                m01_6[k] += 6 * r + 3
+            else:
+                area6[k] += 3
+                m10_6[k] += sx
+                m01_6[k] += sy
+
+    # Size filter and centroids, in reverse raster order of each blob's
+    # top-left pixel as cv2.findContours returns external contours
+    centroids = np.empty((n, 2), np.int64)
+    m = 0
+    for k in range(n - 1, -1, -1):
+        area = area6[k] / 6
+        if min_size <= area <= max_size and area6[k] != 0:
+            centroids[m, 0] = m10_6[k] // area6[k]
+            centroids[m, 1] = m01_6[k] // area6[k]
+            m += 1
+
+    return mask, centroids[:m]
+
+
+# Compile once at import rather than on the first live frame
+_detect_blobs(np.zeros((8, 8)), np.zeros((8, 8)), TEMP_THRESHOLD, MIN_BLOB_SIZE, MAX_BLOB_SIZE)
+
+
 def detect_people(frame, bg):
-    diff = frame - bg
-    mask = np.where(diff > TEMP_THRESHOLD, 255, 0).astype(np.uint8)
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-    blobs = []
-    for c in contours:
-        area = cv2.contourArea(c)
-        if MIN_BLOB_SIZE <= area <= MAX_BLOB_SIZE:
-            M = cv2.moments(c)
-            if M["m00"] != 0:
-                cx = int(M["m10"] / M["m00"])
-                cy = int(M["m01"] / M["m00"])
-                blobs.append((cx, cy))
+    mask, centroids = _detect_blobs(frame, bg, TEMP_THRESHOLD, MIN_BLOB_SIZE, MAX_BLOB_SIZE)
+    blobs = [(int(cx), int(cy)) for cx, cy in centroids]
     return blobs, mask
@@ -0,0 +1,51 @@
+# test_people_counter.py
+import numpy as np
+import cv2
+import pytest
+from config import TEMP_THRESHOLD, MIN_BLOB_SIZE, MAX_BLOB_SIZE
+from people_counter import detect_people
+
+
+def reference_detect_people(frame, bg):
+    # The OpenCV contour pipeline that _detect_blobs reproduces
+    diff = frame - bg
+    mask = np.where(diff > TEMP_THRESHOLD, 255, 0).astype(np.uint8)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    blobs = []
+    for c in contours:
+        area = cv2.contourArea(c)
+        if MIN_BLOB_SIZE <= area <= MAX_BLOB_SIZE:
+            M = cv2.moments(c)
+            if M["m00"] != 0:
+                cx = int(M["m10"] / M["m00"])
+                cy = int(M["m01"] / M["m00"])
+                blobs.append((cx, cy))
+    return blobs, mask
+
+
+def assert_matches_reference(frame, bg):
+    blobs, mask = detect_people(frame, bg)
+    ref_blobs, ref_mask = reference_detect_people(frame, bg)
+    assert np.array_equal(mask, ref_mask)
+    assert blobs == ref_blobs
+
+
+@pytest.mark.parametrize("density", [0.1, 0.3, 0.5, 0.7, 0.9])
+def test_random_masks_match_opencv(density):
+    rng = np.random.default_rng(0)
+    bg = np.full((8, 8), 22.0)
+    for _ in range(500):
+        hot = rng.random((8, 8)) < density
+        frame = bg + np.where(hot, rng.uniform(1.5, 8.0, (8, 8)), rng.uniform(-1.0, 1.0, (8, 8)))
+        assert_matches_reference(frame, bg)
+
+
+def test_ring_with_hole_and_diagonal_neighbours():
+    bg = np.zeros((8, 8))
+    frame = np.zeros((8, 8))
+    frame[1:6, 1:6] = 5.0
+    frame[3, 3] = 0.0   # hole, covered by the outer contour
+    frame[6, 6] = 5.0   # touches the ring only diagonally
+    frame[0, 7] = 5.0   # single border pixel
+    assert_matches_reference(frame, bg)
@@ -1,5 +1,10 @@
 # utils.py
 import numpy as np
 
-def smooth_background(bg, frame, rate=0.001):
-    return (1 - rate) * bg + rate * frame
+def smooth_background(bg, frame, rate=0.001, out=None):
+    if out is None:
+        return (1 - rate) * bg + rate * frame
+    # Same blend, written into an existing buffer (may be bg itself)
+    np.multiply(bg, 1 - rate, out=out)
+    out += rate * frame
+    return out
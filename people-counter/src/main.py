@@ -4,10 +4,15 @@ Integrates all modules for real-time people counting
 """
 
 import cv2
+import numpy as np
 import yaml
 import logging
+import logging.handlers
+import queue
+import threading
 import time
 import argparse
+import atexit
 import sys
 import os
 from datetime import datetime
@@ -35,9 +40,9 @@ class PeopleCounter:
         Args:
             config_path: Path to configuration file
         """
-        # Load configuration
+        # Load configuration (libyaml-backed loader when available)
         with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+            self.config = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
         
         # Setup logging
         self._setup_logging()
@@ -59,6 +64,14 @@ class PeopleCounter:
         self.running = False
         self.background_initialized = False
         
+        # Difference frame buffer, allocated once the background is known
+        self._diff_buf = None
+        
+        # Frames from the sensor thread and results for the display loop
+        self._frame_queue = queue.Queue(maxsize=2)
+        self._result_queue = queue.Queue(maxsize=1)
+        self._reset_requested = threading.Event()
+        
         self.logger.info("All modules initialized successfully")
     
     def _setup_logging(self):
@@ -68,14 +81,29 @@ class PeopleCounter:
         # Create log directory
         os.makedirs(os.path.dirname(log_config['log_file']), exist_ok=True)
         
+        # File and console output run on a listener thread, so entrance/exit
+        # messages never block frame processing on disk or terminal I/O
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = [
+            logging.FileHandler(log_config['log_file']),
+            logging.StreamHandler()
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.Queue()
+        self._log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+        
+        # Records are formatted by the listener's handlers
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
         # Configure logging
         logging.basicConfig(
             level=getattr(logging, log_config['log_level']),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_config['log_file']),
-                logging.StreamHandler()
-            ]
+            handlers=[queue_handler]
         )
     
     def initialize_background(self, use_saved=True):
@@ -90,6 +118,7 @@ class PeopleCounter:
         # Try to load saved background
         if use_saved and self.background_estimator.load_background():
             self.background_initialized = True
+            self._allocate_buffers()
             return
         
         # Calculate new background
@@ -99,9 +128,15 @@ class PeopleCounter:
         
         self.background_estimator.calculate_background(self.sensor_reader)
         self.background_initialized = True
+        self._allocate_buffers()
         
         self.logger.info("Background initialization complete")
     
+    def _allocate_buffers(self):
+        """Allocate per-frame work buffers matching the background"""
+        background = self.background_estimator.get_background()
+        self._diff_buf = np.empty_like(background)
+    
     def process_frame(self, frame_data):
         """
         Process a single frame
@@ -117,13 +152,16 @@ class PeopleCounter:
         
         # Get background
         background = self.background_estimator.get_background()
-        background_temp = background.mean()
+        background_temp = self.background_estimator.get_background_mean()
         
-        # Calculate difference
-        diff_frame = self.background_estimator.get_difference_frame(frame)
+        # Difference frame and its max in one pass; the max drives the
+        # presence check and the difference feeds body extraction
+        diff_frame, _, diff_max = self.background_estimator.get_difference_stats(
+            frame, out=self._diff_buf
+        )
         
         # Check if frame contains human
-        has_human = self.noise_filter.has_human(diff_frame, background_temp)
+        has_human = self.noise_filter.has_human(diff_frame, background_temp, diff_max)
         
         bodies = []
         tracking_status = None
@@ -137,6 +175,11 @@ class PeopleCounter:
         else:
             # Update tracker with no bodies
             tracking_status = self.tracker.update([], timestamp)
+            
+            # Nothing downstream needs the difference of an empty frame
+            # unless it is displayed
+            if not self.visualizer.needs_diff:
+                diff_frame = None
         
         return {
             'frame': frame,
@@ -160,36 +203,35 @@ class PeopleCounter:
         self.logger.info("=" * 50)
         
         self.running = True
-        frame_count = 0
+        
+        threads = [
+            threading.Thread(target=self._acquisition_loop, name="acquisition", daemon=True),
+            threading.Thread(target=self._processing_loop, name="processing", daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        vis_image = None
         
         try:
             while self.running:
-                # Read frame
-                frame_data = self.sensor_reader.get_frame_sync()
+                # Show the latest results, if any arrived
+                try:
+                    results = self._result_queue.get(timeout=0.01)
+                except queue.Empty:
+                    results = None
                 
-                if frame_data is None:
-                    time.sleep(0.01)
-                    continue
-                
-                # Wrap in dict with timestamp
-                frame_data = {
-                    'frame': frame_data,
-                    'timestamp': time.time()
-                }
-                
-                # Process frame
-                results = self.process_frame(frame_data)
-                
-                # Visualize
-                vis_image = self.visualizer.visualize_frame(
-                    results['frame'],
-                    results['bodies'],
-                    results['tracking_status'],
-                    diff_frame=results['diff_frame']
-                )
-                
-                if vis_image is not None:
-                    self.visualizer.show(vis_image)
+                if results is not None:
+                    # Visualize
+                    vis_image = self.visualizer.visualize_frame(
+                        results['frame'],
+                        results['bodies'],
+                        results['tracking_status'],
+                        diff_frame=results['diff_frame']
+                    )
+                    
+                    if vis_image is not None:
+                        self.visualizer.show(vis_image)
                 
                 # Handle keyboard input
                 key = cv2.waitKey(1) & 0xFF
@@ -200,11 +242,94 @@ class PeopleCounter:
                 
                 elif key == ord('r'):
                     self.logger.info("Resetting counts")
-                    self.tracker.reset_counts()
+                    self._reset_requested.set()
                 
                 elif key == ord('s'):
                     filename = f"data/frame_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
                     self.visualizer.save_frame(vis_image, filename)
+        
+        except KeyboardInterrupt:
+            self.logger.info("Interrupted by user")
+        
+        finally:
+            self.running = False
+            for thread in threads:
+                thread.join(timeout=1.0)
+            self.cleanup()
+    
+    def _acquisition_loop(self):
+        """
+        Read frames from the sensor and queue them for processing
+        """
+        frame_interval = self.sensor_reader.frame_interval
+        
+        try:
+            # Read at the sensor frame rate, scheduled on a monotonic clock
+            deadline = time.monotonic()
+            
+            while self.running:
+                deadline += frame_interval
+                sleep_time = deadline - time.monotonic()
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                elif sleep_time < -frame_interval:
+                    # Fell more than a frame behind; resync instead of bursting
+                    deadline = time.monotonic()
+                
+                # Read frame
+                frame = self.sensor_reader.get_frame_sync()
+                
+                if frame is None:
+                    continue
+                
+                # Wrap in dict with timestamp (monotonic, so wall-clock
+                # adjustments cannot age out or revive tracks)
+                frame_data = {
+                    'frame': frame,
+                    'timestamp': time.monotonic()
+                }
+                
+                while self.running:
+                    try:
+                        self._frame_queue.put(frame_data, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        
+        except Exception as e:
+            self.logger.exception(f"Acquisition failed: {e}")
+            self.running = False
+    
+    def _processing_loop(self):
+        """
+        Process queued frames and hand the latest results to the display loop
+        """
+        frame_count = 0
+        
+        try:
+            while self.running:
+                try:
+                    frame_data = self._frame_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                
+                if self._reset_requested.is_set():
+                    self._reset_requested.clear()
+                    self.tracker.reset_counts()
+                
+                # Process frame
+                results = self.process_frame(frame_data)
+                
+                # The diff buffer is reused for the next frame
+                if results['diff_frame'] is not None:
+                    results['diff_frame'] = results['diff_frame'].copy()
+                
+                # Keep only the newest results for display
+                try:
+                    self._result_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._result_queue.put_nowait(results)
                 
                 frame_count += 1
                 
@@ -217,11 +342,9 @@ class PeopleCounter:
                         f"Exits: {status['total_exits']}"
                     )
         
-        except KeyboardInterrupt:
-            self.logger.info("Interrupted by user")
-        
-        finally:
-            self.cleanup()
+        except Exception as e:
+            self.logger.exception(f"Processing failed: {e}")
+            self.running = False
     
     def cleanup(self):
         """Cleanup resources"""
@@ -0,0 +1,79 @@
+"""
+Numba Kernels
+Fused per-frame numeric loops for the 8x8 processing path
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def diff_mean_max(frame, background, out_diff):
+    """
+    Subtract background from frame and reduce the result in a single pass
+
+    Args:
+        frame: Current frame (2D array)
+        background: Background temperature matrix, same shape as frame
+        out_diff: Output buffer for the difference frame, same shape as frame
+
+    Returns:
+        tuple: (mean difference, max difference)
+    """
+    rows, cols = frame.shape
+    s = 0.0
+    m = frame[0, 0] - background[0, 0]
+
+    for i in range(rows):
+        for j in range(cols):
+            d = frame[i, j] - background[i, j]
+            out_diff[i, j] = d
+            s += d
+            if d > m:
+                m = d
+
+    return s / (rows * cols), m
+
+
+@njit(cache=True)
+def assignment_costs(body_locs, body_temps, last_locs, last_temps, last_ts,
+                     timestamp, spatial_threshold, temp_threshold,
+                     temporal_threshold, invalid_cost):
+    """
+    Gate every body/person pair and price the ones that pass
+
+    Args:
+        body_locs: Body locations
+        body_temps: Body average temperatures
+        last_locs: Last location of each person
+        last_temps: Last temperature of each person
+        last_ts: Last timestamp of each person
+        timestamp: Current timestamp
+        spatial_threshold: Max location distance
+        temp_threshold: Max temperature distance
+        temporal_threshold: Max frames since a person was last seen
+        invalid_cost: Cost assigned to gated-out pairs
+
+    Returns:
+        numpy.ndarray: (bodies, persons) cost matrix
+    """
+    n_bodies = body_locs.shape[0]
+    n_persons = last_locs.shape[0]
+    cost = np.empty((n_bodies, n_persons), dtype=np.float64)
+
+    for j in range(n_persons):
+        frame_diff = (timestamp - last_ts[j]) * 10  # Assuming 10 FPS
+        recent = frame_diff <= temporal_threshold
+        for i in range(n_bodies):
+            dloc = abs(body_locs[i] - last_locs[j])
+            dtemp = abs(body_temps[i] - last_temps[j])
+            if recent and dloc <= spatial_threshold and dtemp <= temp_threshold:
+                # Temperature distance scaled into location units
+                if temp_threshold > 0:
+                    cost[i, j] = dloc + dtemp / temp_threshold * spatial_threshold
+                else:
+                    cost[i, j] = dloc
+            else:
+                cost[i, j] = invalid_cost
+
+    return cost
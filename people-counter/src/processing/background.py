@@ -4,11 +4,15 @@ Calculates and maintains background temperature reference
 """
 
 import numpy as np
+import cv2
 import logging
 import os
-import pickle
+import queue
+import threading
 from datetime import datetime
 
+from ._kernels import diff_mean_max
+
 
 class BackgroundEstimator:
     """
@@ -26,13 +30,17 @@ class BackgroundEstimator:
         self.logger = logging.getLogger(__name__)
         
         self.num_frames = config['background']['num_frames']
-        self.temp_variance = config['background']['temperature_variance']
+        self.temp_variance = float(config['background']['temperature_variance'])
         
         self.background = None
         self.background_std = None
+        self.background_mean = None
         self.is_initialized = False
         
-        self.background_file = 'data/background/background.pkl'
+        # Scratch buffer for is_background_valid
+        self._absdiff_buf = None
+        
+        self.background_file = 'data/background/background.npz'
     
     def calculate_background(self, sensor_reader):
         """
@@ -46,34 +54,75 @@ class BackgroundEstimator:
         """
         self.logger.info(f"Collecting {self.num_frames} frames for background calculation...")
         
-        frames = []
+        # Read frames on a prefetch thread so sensor waits overlap the updates
+        frames = queue.Queue(maxsize=4)
+        reader = threading.Thread(
+            target=self._prefetch_frames, args=(sensor_reader, frames), daemon=True
+        )
+        reader.start()
+        
+        # Running pixel-wise mean and sum of squared deviations (Welford)
+        n = 0
+        mean = None
+        m2 = None
         
         for i in range(self.num_frames):
-            frame = sensor_reader.read_frame()
+            frame = frames.get()
             
             if frame is not None:
-                frames.append(frame)
+                if mean is None:
+                    mean = np.zeros(frame.shape, dtype=np.float64)
+                    m2 = np.zeros_like(mean)
+                
+                n += 1
+                delta = frame - mean
+                mean += delta / n
+                m2 += delta * (frame - mean)
                 
                 if (i + 1) % 50 == 0:
                     self.logger.info(f"Collected {i + 1}/{self.num_frames} frames")
         
-        if len(frames) < self.num_frames:
-            self.logger.warning(f"Only collected {len(frames)} frames")
+        reader.join()
+        
+        if n == 0:
+            self.logger.error("No frames collected, background not calculated")
+            return None
+        
+        if n < self.num_frames:
+            self.logger.warning(f"Only collected {n} frames")
         
-        # Calculate pixel-wise average
-        frames_array = np.array(frames)
-        self.background = np.mean(frames_array, axis=0)
-        self.background_std = np.std(frames_array, axis=0)
+        # Pixel-wise average and (population) standard deviation,
+        # accumulated in float64 and stored as float32
+        self.background = mean.astype(np.float32)
+        self.background_std = np.sqrt(m2 / n).astype(np.float32)
+        self.background_mean = float(self.background.mean(dtype=np.float64))
         
         self.is_initialized = True
         
-        self.logger.info(f"Background calculated. Mean temp: {np.mean(self.background):.2f}°C")
+        self.logger.info(f"Background calculated. Mean temp: {self.background_mean:.2f}°C")
         
         # Save background
         self.save_background()
         
         return self.background
     
+    def _prefetch_frames(self, sensor_reader, frames):
+        """
+        Read the background frames and queue them for calculate_background
+        
+        Args:
+            sensor_reader: GridEyeReader instance
+            frames: Queue receiving one entry (frame or None) per read
+        """
+        for _ in range(self.num_frames):
+            try:
+                frame = sensor_reader.read_frame()
+            except Exception as e:
+                self.logger.error(f"Failed to read background frame: {e}")
+                frame = None
+            
+            frames.put(frame)
+    
     def get_background(self):
         """
         Get current background
@@ -87,6 +136,19 @@ class BackgroundEstimator:
         
         return self.background
     
+    def get_background_mean(self):
+        """
+        Get mean temperature of current background
+        
+        Returns:
+            float: Background average temperature
+        """
+        if not self.is_initialized:
+            self.logger.warning("Background not initialized")
+            return None
+        
+        return self.background_mean
+    
     def get_background_std(self):
         """
         Get background standard deviation
@@ -101,14 +163,12 @@ class BackgroundEstimator:
         try:
             os.makedirs(os.path.dirname(self.background_file), exist_ok=True)
             
-            data = {
-                'background': self.background,
-                'background_std': self.background_std,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open(self.background_file, 'wb') as f:
-                pickle.dump(data, f)
+            np.savez(
+                self.background_file,
+                background=self.background,
+                background_std=self.background_std,
+                timestamp=np.array(datetime.now().isoformat())
+            )
             
             self.logger.info(f"Background saved to {self.background_file}")
             
@@ -127,15 +187,16 @@ class BackgroundEstimator:
                 self.logger.info("No saved background found")
                 return False
             
-            with open(self.background_file, 'rb') as f:
-                data = pickle.load(f)
+            with np.load(self.background_file) as data:
+                self.background = data['background'].astype(np.float32, copy=False)
+                self.background_std = data['background_std'].astype(np.float32, copy=False)
+                timestamp = str(data['timestamp'])
             
-            self.background = data['background']
-            self.background_std = data['background_std']
+            self.background_mean = float(self.background.mean(dtype=np.float64))
             self.is_initialized = True
             
             self.logger.info(f"Background loaded from {self.background_file}")
-            self.logger.info(f"Background timestamp: {data['timestamp']}")
+            self.logger.info(f"Background timestamp: {timestamp}")
             
             return True
             
@@ -143,12 +204,13 @@ class BackgroundEstimator:
             self.logger.error(f"Failed to load background: {e}")
             return False
     
-    def get_difference_frame(self, frame):
+    def get_difference_frame(self, frame, out=None):
         """
         Calculate difference from background
         
         Args:
             frame: Current frame
+            out: Optional preallocated buffer to write the difference into
             
         Returns:
             numpy.ndarray: Difference frame
@@ -156,7 +218,30 @@ class BackgroundEstimator:
         if not self.is_initialized:
             return None
         
-        return frame - self.background
+        frame = np.asarray(frame, dtype=self.background.dtype)
+        
+        return cv2.subtract(frame, self.background, dst=out)
+    
+    def get_difference_stats(self, frame, out=None):
+        """
+        Calculate difference from background together with its mean and max
+        
+        Args:
+            frame: Current frame
+            out: Optional preallocated buffer to write the difference into
+            
+        Returns:
+            tuple: (difference frame, mean difference, max difference)
+        """
+        if not self.is_initialized:
+            return None
+        
+        if out is None:
+            out = np.empty_like(self.background)
+        
+        diff_mean, diff_max = diff_mean_max(frame, self.background, out)
+        
+        return out, diff_mean, diff_max
     
     def is_background_valid(self, frame):
         """
@@ -171,7 +256,12 @@ class BackgroundEstimator:
         if not self.is_initialized:
             return False
         
-        diff = np.abs(frame - self.background)
-        mean_diff = np.mean(diff)
+        frame = np.asarray(frame, dtype=self.background.dtype)
+        
+        if self._absdiff_buf is None or self._absdiff_buf.shape != frame.shape:
+            self._absdiff_buf = np.empty_like(self.background)
+        
+        cv2.absdiff(frame, self.background, dst=self._absdiff_buf)
+        mean_diff = cv2.mean(self._absdiff_buf)[0]
         
         return mean_diff < self.temp_variance
\ No newline at end of file
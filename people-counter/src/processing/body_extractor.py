@@ -6,6 +6,7 @@ Extracts and locates human bodies from thermal frames
 import numpy as np
 import cv2
 import logging
+from scipy import ndimage
 
 
 class BodyExtractor:
@@ -24,10 +25,19 @@ class BodyExtractor:
         self.logger = logging.getLogger(__name__)
         
         # Body detection parameters
-        self.min_body_area = config['body_detection']['min_body_area']
-        self.max_body_area = config['body_detection']['max_body_area']
-        self.large_body_threshold = config['body_detection']['large_body_threshold']
-        self.temp_increment = config['body_detection']['temperature_increment']
+        self.min_body_area = float(config['body_detection']['min_body_area'])
+        self.max_body_area = float(config['body_detection']['max_body_area'])
+        self.large_body_threshold = float(config['body_detection']['large_body_threshold'])
+        self.temp_increment = float(config['body_detection']['temperature_increment'])
+        
+        # Binary mask buffer reused across threshold iterations
+        self._mask_buf = None
+        
+        # Area thresholds in pixels, set from the first frame's shape
+        self._frame_shape = None
+        self._min_area_abs = None
+        self._max_area_abs = None
+        self._large_area_abs = None
     
     def extract_bodies(self, frame, background, diff_frame):
         """
@@ -45,7 +55,7 @@ class BodyExtractor:
         
         # Start with base threshold
         threshold = self.temp_increment
-        frame_area = frame.shape[0] * frame.shape[1]
+        self._update_area_thresholds(frame.shape)
         
         # Initial body extraction
         binary_mask, contours = self._get_contours(diff_frame, threshold)
@@ -54,22 +64,23 @@ class BodyExtractor:
             return bodies
         
         # Find largest contour
-        largest_contour = max(contours, key=cv2.contourArea)
-        largest_area = cv2.contourArea(largest_contour) / frame_area
+        areas = self._contour_areas(contours)
+        idx = int(areas.argmax())
+        largest_contour = contours[idx]
         
         # Check if we might have multiple people
-        if largest_area > self.large_body_threshold:
+        if areas[idx] > self._large_area_abs:
             # Try to separate multiple bodies
-            bodies = self._separate_bodies(diff_frame, frame, threshold)
+            bodies = self._separate_bodies(diff_frame, frame, threshold,
+                                           initial=(contours, areas))
         else:
             # Single body
-            body = self._create_body_dict(largest_contour, frame, diff_frame)
-            if body:
-                bodies.append(body)
+            bodies = self._create_body_dicts([largest_contour], areas[idx:idx + 1],
+                                             frame, diff_frame)
         
         return bodies
     
-    def _separate_bodies(self, diff_frame, frame, initial_threshold):
+    def _separate_bodies(self, diff_frame, frame, initial_threshold, initial=None):
         """
         Separate multiple bodies using incremental thresholding
         
@@ -77,52 +88,53 @@ class BodyExtractor:
             diff_frame: Difference from background
             frame: Current frame
             initial_threshold: Starting threshold
+            initial: (contours, areas) already found at initial_threshold
             
         Returns:
             list: List of separated bodies
         """
         threshold = initial_threshold
         max_iterations = 8
-        frame_area = frame.shape[0] * frame.shape[1]
+        self._update_area_thresholds(frame.shape)
         
         for iteration in range(max_iterations):
-            binary_mask, contours = self._get_contours(diff_frame, threshold)
+            if iteration == 0 and initial is not None:
+                contours, areas = initial
+            else:
+                binary_mask, contours = self._get_contours(diff_frame, threshold)
+                areas = None
             
             if len(contours) == 0:
                 threshold += self.temp_increment
                 continue
             
             # Check if we found valid bodies
-            valid_contours = []
-            for contour in contours:
-                area_ratio = cv2.contourArea(contour) / frame_area
-                if self.min_body_area <= area_ratio <= self.max_body_area:
-                    valid_contours.append(contour)
+            if areas is None:
+                areas = self._contour_areas(contours)
+            valid = np.flatnonzero((areas >= self._min_area_abs) &
+                                   (areas <= self._max_area_abs))
             
             # If we found 2 valid bodies, we're done
-            if len(valid_contours) >= 2:
-                bodies = []
-                for contour in valid_contours[:2]:  # Max 2 people
-                    body = self._create_body_dict(contour, frame, diff_frame)
-                    if body:
-                        bodies.append(body)
-                return bodies
+            if len(valid) >= 2:
+                valid = valid[:2]  # Max 2 people
+                return self._create_body_dicts([contours[i] for i in valid], areas[valid],
+                                               frame, diff_frame)
             
             # If we found 1 small body, accept it
-            if len(valid_contours) == 1:
-                area_ratio = cv2.contourArea(valid_contours[0]) / frame_area
-                if area_ratio < self.large_body_threshold:
-                    body = self._create_body_dict(valid_contours[0], frame, diff_frame)
-                    return [body] if body else []
+            if len(valid) == 1:
+                i = valid[0]
+                if areas[i] < self._large_area_abs:
+                    return self._create_body_dicts([contours[i]], areas[valid],
+                                                   frame, diff_frame)
             
             # Increase threshold and try again
             threshold += self.temp_increment
         
         # Fallback: return largest contour
         if len(contours) > 0:
-            largest = max(contours, key=cv2.contourArea)
-            body = self._create_body_dict(largest, frame, diff_frame)
-            return [body] if body else []
+            idx = int(areas.argmax())
+            return self._create_body_dicts([contours[idx]], areas[idx:idx + 1],
+                                           frame, diff_frame)
         
         return []
     
@@ -137,8 +149,11 @@ class BodyExtractor:
         Returns:
             tuple: (binary_mask, contours)
         """
-        # Create binary mask
-        binary_mask = (diff_frame >= threshold).astype(np.uint8) * 255
+        # Create binary mask (0 or 255) in the reusable buffer
+        if self._mask_buf is None or self._mask_buf.shape != diff_frame.shape:
+            self._mask_buf = np.empty(diff_frame.shape, dtype=np.uint8)
+        
+        binary_mask = cv2.compare(diff_frame, threshold, cv2.CMP_GE, dst=self._mask_buf)
         
         # Find contours
         contours, _ = cv2.findContours(
@@ -147,81 +162,100 @@ class BodyExtractor:
         
         return binary_mask, contours
     
-    def _create_body_dict(self, contour, frame, diff_frame):
+    def _update_area_thresholds(self, frame_shape):
         """
-        Create body dictionary with features
+        Convert the area ratio thresholds to pixel areas for this frame shape
         
         Args:
-            contour: Body contour
-            frame: Current frame
-            diff_frame: Difference frame
+            frame_shape: Shape of the thermal frame
+        """
+        if frame_shape == self._frame_shape:
+            return
+        
+        frame_area = frame_shape[0] * frame_shape[1]
+        self._min_area_abs = self.min_body_area * frame_area
+        self._max_area_abs = self.max_body_area * frame_area
+        self._large_area_abs = self.large_body_threshold * frame_area
+        self._frame_shape = frame_shape
+    
+    def _contour_areas(self, contours):
+        """
+        Calculate the area of each contour
+        
+        Args:
+            contours: Sequence of contours
             
         Returns:
-            dict: Body features
+            numpy.ndarray: Contour areas
         """
-        # Get bounding box
-        x, y, w, h = cv2.boundingRect(contour)
-        
-        # Calculate center
-        M = cv2.moments(contour)
-        if M["m00"] == 0:
-            return None
-        
-        cx = int(M["m10"] / M["m00"])
-        cy = int(M["m01"] / M["m00"])
-        
-        # Get location (horizontal position for tracking)
-        location = self._get_body_location(diff_frame, contour)
-        
-        # Calculate average temperature
-        mask = np.zeros(frame.shape, dtype=np.uint8)
-        cv2.drawContours(mask, [contour], 0, 1, -1)
-        avg_temp = np.mean(frame[mask == 1])
-        
-        # Calculate max temperature
-        max_temp = np.max(frame[mask == 1])
-        
-        body = {
-            'contour': contour,
-            'bounding_box': (x, y, w, h),
-            'center': (cx, cy),
-            'location': location,
-            'avg_temp': avg_temp,
-            'max_temp': max_temp,
-            'area': cv2.contourArea(contour)
-        }
-        
-        return body
+        return np.fromiter((cv2.contourArea(c) for c in contours),
+                           dtype=np.float64, count=len(contours))
     
-    def _get_body_location(self, diff_frame, contour):
+    def _create_body_dicts(self, contours, areas, frame, diff_frame):
         """
-        Get horizontal location of body (for tracking)
+        Create body dictionaries with features for a set of contours
+        
+        All bodies are rasterized into one label image so their
+        temperature and location statistics come from a single pass.
         
         Args:
+            contours: Body contours
+            areas: Contour areas
+            frame: Current frame
             diff_frame: Difference frame
-            contour: Body contour
             
         Returns:
-            float: Normalized horizontal position (0-1)
+            list: Body feature dictionaries (degenerate contours skipped)
         """
-        # Create mask for this body
-        mask = np.zeros(diff_frame.shape, dtype=np.uint8)
-        cv2.drawContours(mask, [contour], 0, 1, -1)
-        
-        # Calculate column sums
-        col_sums = np.sum(mask, axis=0)
+        labels = np.zeros(frame.shape, dtype=np.uint8)
+        kept = []
         
-        # Find center of mass
-        if np.sum(col_sums) == 0:
-            return 0.5
+        for contour, area in zip(contours, areas):
+            # Calculate center
+            M = cv2.moments(contour)
+            if M["m00"] == 0:
+                continue
+            
+            kept.append((contour, area, M))
+            cv2.drawContours(labels, [contour], 0, len(kept), -1)
+        
+        if not kept:
+            return []
+        
+        # Per-body pixel count, temperature sum/max and column sum, gathered
+        # over body pixels only
+        n = len(kept) + 1
+        rows, cols = np.nonzero(labels)
+        body_labels = labels[rows, cols]
+        counts = np.bincount(body_labels, minlength=n)
+        temp_sums = np.bincount(body_labels, weights=frame[rows, cols], minlength=n)
+        col_sums = np.bincount(body_labels, weights=cols, minlength=n)
+        max_temps = ndimage.maximum(frame, labels, index=np.arange(1, n))
         
-        weighted_sum = np.sum(col_sums * np.arange(len(col_sums)))
-        location = weighted_sum / np.sum(col_sums)
+        bodies = []
         
-        # Normalize to 0-1
-        normalized_location = location / diff_frame.shape[1]
+        for label, (contour, area, M) in enumerate(kept, start=1):
+            # Get bounding box
+            x, y, w, h = cv2.boundingRect(contour)
+            
+            cx = int(M["m10"] / M["m00"])
+            cy = int(M["m01"] / M["m00"])
+            
+            # Get location (horizontal position for tracking), normalized
+            # column center of mass of the body pixels
+            location = (col_sums[label] / counts[label]) / diff_frame.shape[1]
+            
+            bodies.append({
+                'contour': contour,
+                'bounding_box': (x, y, w, h),
+                'center': (cx, cy),
+                'location': location,
+                'avg_temp': temp_sums[label] / counts[label],
+                'max_temp': max_temps[label - 1],
+                'area': float(area)
+            })
         
-        return normalized_location
+        return bodies
     
     def find_body_locations(self, bodies, frame_width):
         """
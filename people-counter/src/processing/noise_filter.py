@@ -6,7 +6,6 @@ Implements noise detection and filtering techniques from the paper
 import numpy as np
 import cv2
 import logging
-from scipy import stats
 
 
 class NoiseFilter:
@@ -26,10 +25,10 @@ class NoiseFilter:
         self.logger = logging.getLogger(__name__)
         
         # Filter parameters
-        self.temp_threshold = config['noise_filter']['temperature_threshold']
-        self.otsu_threshold = config['noise_filter']['otsu_threshold']
-        self.width_threshold = config['noise_filter']['heat_distribution']['width_threshold']
-        self.amplitude_threshold = config['noise_filter']['heat_distribution']['amplitude_threshold']
+        self.temp_threshold = float(config['noise_filter']['temperature_threshold'])
+        self.otsu_threshold = float(config['noise_filter']['otsu_threshold'])
+        self.width_threshold = float(config['noise_filter']['heat_distribution']['width_threshold'])
+        self.amplitude_threshold = float(config['noise_filter']['heat_distribution']['amplitude_threshold'])
     
     #def has_human(self, diff_frame, background_temp):
         #Detect if frame contains a human using multi-stage filtering
@@ -54,13 +53,14 @@ class NoiseFilter:
         
         #return True
     
-    def has_human(self, diff_frame, background_temp):
+    def has_human(self, diff_frame, background_temp, diff_max=None):
         """
         Detect if frame contains a human using a simple max pixel check
         
         Args:
             diff_frame: Difference from background
             background_temp: Background average temperature
+            diff_max: Max of diff_frame if already known
             
         Returns:
             bool: True if human detected
@@ -73,7 +73,10 @@ class NoiseFilter:
         # hotter than the background, we check for a body.
         max_pixel_threshold = self.otsu_threshold
         
-        if np.max(diff_frame) >= max_pixel_threshold:
+        if diff_max is None:
+            diff_max = np.max(diff_frame)
+        
+        if diff_max >= max_pixel_threshold:
             return True
         
         return False
@@ -130,17 +133,15 @@ class NoiseFilter:
             histogram: 1D array
             
         Returns:
-            list: Indices of peaks
+            numpy.ndarray: Indices of peaks
         """
-        peaks = []
+        h = np.asarray(histogram)
+        centre = h[1:-1]
         
-        for i in range(1, len(histogram) - 1):
-            if histogram[i] > histogram[i-1] and histogram[i] > histogram[i+1]:
-                # Local maximum
-                if histogram[i] > 2:  # Minimum threshold
-                    peaks.append(i)
+        # Local maxima above the minimum threshold
+        mask = (centre > h[:-2]) & (centre > h[2:]) & (centre > 2)
         
-        return peaks
+        return np.nonzero(mask)[0] + 1
     
     def _calculate_peak_width(self, histogram, peak_idx):
         """
@@ -5,8 +5,10 @@ Tracks people across frames and determines direction of movement
 
 import numpy as np
 import logging
-from collections import deque
 import time
+from scipy.optimize import linear_sum_assignment
+
+from ._kernels import assignment_costs
 
 
 class Person:
@@ -14,6 +16,9 @@ class Person:
     Represents a tracked person
     """
     
+    # Number of recent observations kept per person
+    HISTORY = 20
+    
     def __init__(self, person_id, body, timestamp):
         """
         Initialize person tracker
@@ -24,9 +29,14 @@ class Person:
             timestamp: Time of first detection
         """
         self.id = person_id
-        self.locations = deque(maxlen=20)
-        self.temperatures = deque(maxlen=20)
-        self.timestamps = deque(maxlen=20)
+        
+        # Ring buffers of recent observations
+        self._loc = np.empty(self.HISTORY, dtype=np.float64)
+        self._temp = np.empty(self.HISTORY, dtype=np.float64)
+        self._ts = np.empty(self.HISTORY, dtype=np.float64)
+        self._head = 0  # Next slot to write
+        self._n = 0  # Number of filled slots
+        self._temp_sum = 0.0  # Running sum of the buffered temperatures
         self.frames_tracked = 0
         
         # Add initial data
@@ -43,10 +53,22 @@ class Person:
             body: Body dictionary
             timestamp: Current timestamp
         """
-        self.locations.append(body['location'])
-        self.temperatures.append(body['avg_temp'])
-        self.timestamps.append(timestamp)
+        if self._n == self.HISTORY:
+            # Oldest observation is about to be overwritten
+            self._temp_sum -= float(self._temp[self._head])
+        
+        self._loc[self._head] = body['location']
+        self._temp[self._head] = body['avg_temp']
+        self._ts[self._head] = timestamp
+        self._temp_sum += float(self._temp[self._head])
+        self._head = (self._head + 1) % self.HISTORY
+        self._n = min(self._n + 1, self.HISTORY)
         self.frames_tracked += 1
+        
+        # Most recent observation, kept as plain attributes for matching
+        self.last_location = body['location']
+        self.last_temperature = body['avg_temp']
+        self.last_timestamp = timestamp
     
     def determine_direction(self, min_frames=3):
         """
@@ -64,12 +86,16 @@ class Person:
         if self.direction_determined:
             return self.direction
         
-        # Analyze location trajectory
-        locations = list(self.locations)
-        
-        # Calculate movement direction
-        start_location = np.mean(locations[:2])
-        end_location = np.mean(locations[-2:])
+        # Calculate movement direction from the first and last two observations
+        oldest = self._head - self._n
+        newest = self._head - 1
+        if self._n >= 2:
+            start_location = (self._loc[oldest % self.HISTORY] +
+                              self._loc[(oldest + 1) % self.HISTORY]) / 2
+            end_location = (self._loc[(newest - 1) % self.HISTORY] +
+                            self._loc[newest % self.HISTORY]) / 2
+        else:
+            start_location = end_location = self._loc[newest % self.HISTORY]
         
         movement = end_location - start_location
         
@@ -96,19 +122,19 @@ class Person:
         Returns:
             bool: True if stale
         """
-        if len(self.timestamps) == 0:
+        if self._n == 0:
             return True
         
-        last_seen = self.timestamps[-1]
+        last_seen = self.last_timestamp
         age = current_time - last_seen
         
         return age > max_age
     
     def get_avg_temperature(self):
         """Get average temperature across observations"""
-        if len(self.temperatures) == 0:
+        if self._n == 0:
             return 0
-        return np.mean(self.temperatures)
+        return self._temp_sum / self._n
 
 
 class PeopleTracker:
@@ -127,9 +153,9 @@ class PeopleTracker:
         self.logger = logging.getLogger(__name__)
         
         # Tracking parameters
-        self.spatial_threshold = config['tracking']['spatial_distance_threshold']
-        self.temp_threshold = config['tracking']['temperature_distance_threshold']
-        self.temporal_threshold = config['tracking']['temporal_distance_threshold']
+        self.spatial_threshold = float(config['tracking']['spatial_distance_threshold'])
+        self.temp_threshold = float(config['tracking']['temperature_distance_threshold'])
+        self.temporal_threshold = float(config['tracking']['temporal_distance_threshold'])
         self.min_tracking_frames = config['tracking']['min_tracking_frames']
         
         # Active persons being tracked
@@ -160,18 +186,16 @@ class PeopleTracker:
         matched_persons = []
         unmatched_bodies = []
         
-        for body in bodies:
-            matched = False
-            
-            for person in self.active_persons:
-                if self._is_match(person, body, timestamp):
-                    person.update(body, timestamp)
-                    matched_persons.append(person)
-                    matched = True
-                    break
-            
-            if not matched:
+        match = self._match_bodies(bodies, timestamp)
+        
+        for body, person_idx in zip(bodies, match):
+            if person_idx < 0:
                 unmatched_bodies.append(body)
+                continue
+            
+            person = self.active_persons[person_idx]
+            person.update(body, timestamp)
+            matched_persons.append(person)
         
         # Create new persons for unmatched bodies
         for body in unmatched_bodies:
@@ -192,41 +216,49 @@ class PeopleTracker:
         # Return current status
         return self._get_status()
     
-    def _is_match(self, person, body, timestamp):
+    def _match_bodies(self, bodies, timestamp):
         """
-        Check if body matches person
+        Assign bodies to active persons
+        
+        Spatial, temperature and temporal gates are evaluated for every
+        body/person pair at once, then bodies and persons are paired by a
+        minimum-cost assignment over the pairs that pass all three.
         
         Args:
-            person: Person object
-            body: Body dictionary
+            bodies: List of body dictionaries
             timestamp: Current timestamp
             
         Returns:
-            bool: True if match
+            numpy.ndarray: Index into active_persons per body, -1 if unmatched
         """
-        # Spatial distance check
-        last_location = person.locations[-1]
-        spatial_distance = abs(body['location'] - last_location)
-        
-        if spatial_distance > self.spatial_threshold:
-            return False
-        
-        # Temperature distance check
-        last_temp = person.temperatures[-1]
-        temp_distance = abs(body['avg_temp'] - last_temp)
-        
-        if temp_distance > self.temp_threshold:
-            return False
-        
-        # Temporal distance check
-        last_timestamp = person.timestamps[-1]
-        time_diff = timestamp - last_timestamp
-        frame_diff = time_diff * 10  # Assuming 10 FPS
-        
-        if frame_diff > self.temporal_threshold:
-            return False
-        
-        return True
+        match = np.full(len(bodies), -1, dtype=np.intp)
+        n_persons = len(self.active_persons)
+        
+        if not bodies or n_persons == 0:
+            return match
+        
+        last_locs = np.fromiter((p.last_location for p in self.active_persons),
+                                dtype=np.float64, count=n_persons)
+        last_temps = np.fromiter((p.last_temperature for p in self.active_persons),
+                                 dtype=np.float64, count=n_persons)
+        last_ts = np.fromiter((p.last_timestamp for p in self.active_persons),
+                              dtype=np.float64, count=n_persons)
+        
+        body_locs = np.array([b['location'] for b in bodies], dtype=np.float64)
+        body_temps = np.array([b['avg_temp'] for b in bodies], dtype=np.float64)
+        
+        # Gated cost for every (body, person) pair
+        invalid_cost = 1e9
+        cost = assignment_costs(body_locs, body_temps, last_locs, last_temps, last_ts,
+                                timestamp, self.spatial_threshold, self.temp_threshold,
+                                self.temporal_threshold, invalid_cost)
+        
+        # Minimum total cost assignment, dropping gated-out pairs
+        rows, cols = linear_sum_assignment(cost)
+        valid = cost[rows, cols] < invalid_cost
+        match[rows[valid]] = cols[valid]
+        
+        return match
     
     def _check_completed_tracks(self, current_time):
         """
@@ -235,36 +267,36 @@ class PeopleTracker:
         Args:
             current_time: Current timestamp
         """
-        completed = []
+        remaining = []
         
         for person in self.active_persons:
             # Determine direction
             direction = person.determine_direction(self.min_tracking_frames)
             
             if direction and person.frames_tracked >= self.min_tracking_frames:
-                # Check if person has moved significantly
-                locations = list(person.locations)
+                last_location = person.last_location
                 
                 # Check if person has crossed threshold (0.3 or 0.7 normalized position)
                 if direction == 'entrance':
-                    if locations[-1] > 0.7:  # Crossed entrance threshold
-                        completed.append(person)
+                    if last_location > 0.7:  # Crossed entrance threshold
                         self.completed_entrances.append(person)
                         self.total_entrances += 1
                         self.current_occupancy += 1
                         self.logger.info(f"Person {person.id} entered. Occupancy: {self.current_occupancy}")
+                        continue
                 
                 elif direction == 'exit':
-                    if locations[-1] < 0.3:  # Crossed exit threshold
-                        completed.append(person)
+                    if last_location < 0.3:  # Crossed exit threshold
                         self.completed_exits.append(person)
                         self.total_exits += 1
                         self.current_occupancy = max(0, self.current_occupancy - 1)
                         self.logger.info(f"Person {person.id} exited. Occupancy: {self.current_occupancy}")
+                        continue
+            
+            remaining.append(person)
         
-        # Remove completed persons
-        for person in completed:
-            self.active_persons.remove(person)
+        # Keep only persons still crossing, in one pass
+        self.active_persons = remaining
     
     def _remove_stale_persons(self, current_time):
         """
@@ -273,15 +305,16 @@ class PeopleTracker:
         Args:
             current_time: Current timestamp
         """
-        stale_persons = []
+        remaining = []
         
         for person in self.active_persons:
             if person.is_stale(current_time):
-                stale_persons.append(person)
-                self.logger.debug(f"Removing stale person {person.id}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Removing stale person {person.id}")
+            else:
+                remaining.append(person)
         
-        for person in stale_persons:
-            self.active_persons.remove(person)
+        self.active_persons = remaining
     
     def _get_status(self):
         """
@@ -298,7 +331,7 @@ class PeopleTracker:
             'persons': [
                 {
                     'id': p.id,
-                    'location': p.locations[-1] if p.locations else 0,
+                    'location': float(p.last_location),
                     'direction': p.direction,
                     'frames_tracked': p.frames_tracked
                 }
@@ -8,10 +8,33 @@ import numpy as np
 import board
 import busio
 import adafruit_amg88xx
-from collections import deque
+import queue
 import logging
 
 
+# AMG88xx pixel register block and conversion factor
+_PIXEL_OFFSET = bytes([0x80])
+_PIXEL_TEMP_CONVERSION = 0.25
+
+
+def _decode_pixels(words, scratch, out):
+    """
+    Convert raw pixel register words to Celsius
+    
+    Args:
+        words: uint16 register words (12-bit two's complement)
+        scratch: int16 buffer, same shape as words
+        out: float32 output buffer, same shape as words
+        
+    Returns:
+        numpy.ndarray: out
+    """
+    # Move bit 11 into the int16 sign bit, then shift back arithmetically
+    np.left_shift(words, 4, out=scratch, casting='unsafe')
+    np.right_shift(scratch, 4, out=scratch)
+    return np.multiply(scratch, _PIXEL_TEMP_CONVERSION, out=out)
+
+
 class GridEyeReader:
     """
     Manages GridEye AMG8833 thermal sensor
@@ -32,8 +55,8 @@ class GridEyeReader:
         self.frame_rate = config['sensor']['frame_rate']
         self.frame_interval = 1.0 / self.frame_rate
         
-        # Frame queue for buffering
-        self.frame_queue = deque(maxlen=100)
+        # Frame queue for buffering; only the newest frames are kept
+        self.frame_queue = queue.Queue(maxsize=2)
         
         # Initialize sensor
         self._init_sensor()
@@ -49,6 +72,12 @@ class GridEyeReader:
             # Initialize AMG8833
             self.sensor = adafruit_amg88xx.AMG88XX(i2c)
             
+            # Buffers for reading all 64 pixel registers in one transfer
+            self._raw = bytearray(2 * self.resolution[0] * self.resolution[1])
+            self._raw_words = np.frombuffer(self._raw, dtype='<u2').reshape(self.resolution)
+            self._signed = np.empty(self.resolution, dtype=np.int16)
+            self._out = np.empty(self.resolution, dtype=np.float32)
+            
             # Wait for sensor to stabilize
             time.sleep(0.1)
             
@@ -66,13 +95,15 @@ class GridEyeReader:
             numpy.ndarray: 8x8 temperature array
         """
         try:
-            # Read temperature data
-            pixels = self.sensor.pixels
+            # Read the whole pixel block (registers 0x80-0xFF) at once
+            with self.sensor.i2c_device as i2c:
+                i2c.write_then_readinto(_PIXEL_OFFSET, self._raw)
             
-            # Convert to numpy array
-            frame = np.array(pixels)
+            # 12-bit two's complement words, 0.25 C per LSB
+            _decode_pixels(self._raw_words, self._signed, self._out)
             
-            return frame
+            # Frames are queued, so hand out a copy of the shared buffer
+            return self._out.copy()
             
         except Exception as e:
             self.logger.error(f"Error reading frame: {e}")
@@ -86,24 +117,46 @@ class GridEyeReader:
         self.logger.info("Starting frame acquisition")
         self.running = True
         
+        # Schedule reads against a monotonic clock so the rate does not drift
+        deadline = time.monotonic()
+        
         while self.running:
-            start_time = time.time()
-            
             # Read frame
             frame = self.read_frame()
             
             if frame is not None:
-                # Add timestamp
+                # Add timestamp (monotonic, comparable only between frames)
                 frame_data = {
                     'frame': frame,
-                    'timestamp': time.time()
+                    'timestamp': time.monotonic()
                 }
-                self.frame_queue.append(frame_data)
+                self._put_latest(frame_data)
             
             # Maintain frame rate
-            elapsed = time.time() - start_time
-            sleep_time = max(0, self.frame_interval - elapsed)
-            time.sleep(sleep_time)
+            deadline += self.frame_interval
+            sleep_time = deadline - time.monotonic()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            elif sleep_time < -self.frame_interval:
+                # Fell more than a frame behind; resync instead of bursting
+                deadline = time.monotonic()
+    
+    def _put_latest(self, frame_data):
+        """
+        Queue a frame, discarding the oldest one if the queue is full
+        
+        Args:
+            frame_data: Frame data with timestamp
+        """
+        while True:
+            try:
+                self.frame_queue.put_nowait(frame_data)
+                return
+            except queue.Full:
+                try:
+                    self.frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
     
     def get_frame(self):
         """
@@ -112,9 +165,10 @@ class GridEyeReader:
         Returns:
             dict: Frame data with timestamp, or None if queue is empty
         """
-        if len(self.frame_queue) > 0:
-            return self.frame_queue.popleft()
-        return None
+        try:
+            return self.frame_queue.get_nowait()
+        except queue.Empty:
+            return None
     
     def stop_acquisition(self):
         """Stop frame acquisition"""
@@ -28,9 +28,65 @@ class Visualizer:
         self.colormap = getattr(cv2, f"COLORMAP_{config['visualization']['colormap'].upper()}")
         self.display_fps = config['visualization']['display_fps']
         
-        self.fps_values = []
+        # Colormaps as 256-entry BGR lookup tables, built once
+        self._lut = self._colormap_lut(self.colormap)
+        self._diff_lut = self._colormap_lut(cv2.COLORMAP_HOT)
+        
+        # Darkening of the info panel, as blending with black at alpha 0.6
+        ramp = np.arange(256, dtype=np.uint8).reshape(1, 256)
+        self._panel_lut = cv2.addWeighted(np.zeros_like(ramp), 0.6, ramp, 0.4, 0)
+        
+        # Fixed text positions
+        self._min_text_org = (10, self.interpolation_size[1] - 30)
+        self._max_text_org = (10, self.interpolation_size[1] - 10)
+        self._diff_label_org = (self.interpolation_size[0] + 10, 30)
+        
+        # Last 30 FPS samples as a ring buffer with a running sum
+        self._fps_values = np.zeros(30, dtype=np.float64)
+        self._fps_index = 0
+        self._fps_count = 0
+        self._fps_sum = 0.0
         self.last_time = None
     
+    @staticmethod
+    def _colormap_lut(colormap):
+        """
+        Build a lookup table equivalent to cv2.applyColorMap
+        
+        Args:
+            colormap: OpenCV colormap id
+            
+        Returns:
+            numpy.ndarray: (256, 1, 3) uint8 BGR table for cv2.LUT
+        """
+        ramp = np.arange(256, dtype=np.uint8).reshape(256, 1)
+        return cv2.applyColorMap(ramp, colormap)
+    
+    @staticmethod
+    def _colorize(gray, lut, dst=None):
+        """
+        Map an 8-bit image through a colormap lookup table
+        
+        Args:
+            gray: uint8 single-channel image
+            lut: Table from _colormap_lut
+            dst: Optional BGR output (may be a view into a larger image)
+            
+        Returns:
+            numpy.ndarray: BGR image
+        """
+        return cv2.LUT(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR), lut, dst=dst)
+    
+    @property
+    def needs_diff(self):
+        """
+        Whether visualize_frame makes use of a difference frame
+        
+        Returns:
+            bool: True if the diff view is drawn
+        """
+        return self.enabled
+    
     def visualize_frame(self, frame, bodies=None, tracking_status=None, 
                        background=None, diff_frame=None):
         """
@@ -58,7 +114,7 @@ class Visualizer:
         frame_norm = frame_norm.astype(np.uint8)
         
         # Apply colormap
-        frame_color = cv2.applyColorMap(frame_norm, self.colormap)
+        frame_color = self._colorize(frame_norm, self._lut)
         # --- START OF NEW CODE ---
         # Get min/max temperatures from the raw frame
         min_temp = np.min(frame)
@@ -70,11 +126,9 @@ class Visualizer:
         
         # Draw text on the image (bottom-left corner)
         # Using interpolation_size[1] for the y-axis ensures it's at the bottom
-        cv2.putText(frame_color, min_text, 
-                   (10, self.interpolation_size[1] - 30),
+        cv2.putText(frame_color, min_text, self._min_text_org,
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
-        cv2.putText(frame_color, max_text, 
-                   (10, self.interpolation_size[1] - 10),
+        cv2.putText(frame_color, max_text, self._max_text_org,
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
         # --- END OF NEW CODE ---
         # Draw bodies if provided
@@ -112,23 +166,20 @@ class Visualizer:
         scale_x = self.interpolation_size[0] / original_shape[1]
         scale_y = self.interpolation_size[1] / original_shape[0]
         
-        for idx, body in enumerate(bodies):
-            # Scale bounding box
-            x, y, w, h = body['bounding_box']
-            x_scaled = int(x * scale_x)
-            y_scaled = int(y * scale_y)
-            w_scaled = int(w * scale_x)
-            h_scaled = int(h * scale_y)
-            
+        # Scale all boxes and centers at once
+        boxes = np.array([body['bounding_box'] for body in bodies], dtype=np.float64)
+        centers = np.array([body['center'] for body in bodies], dtype=np.float64)
+        boxes_scaled = (boxes * (scale_x, scale_y, scale_x, scale_y)).astype(np.int32).tolist()
+        centers_scaled = (centers * (scale_x, scale_y)).astype(np.int32).tolist()
+        
+        for body, (x_scaled, y_scaled, w_scaled, h_scaled), (cx_scaled, cy_scaled) in zip(
+                bodies, boxes_scaled, centers_scaled):
             # Draw rectangle
             cv2.rectangle(image, (x_scaled, y_scaled), 
                          (x_scaled + w_scaled, y_scaled + h_scaled),
                          (0, 255, 0), 2)
             
             # Draw center point
-            cx, cy = body['center']
-            cx_scaled = int(cx * scale_x)
-            cy_scaled = int(cy * scale_y)
             cv2.circle(image, (cx_scaled, cy_scaled), 5, (0, 255, 255), -1)
             
             # Draw temperature
@@ -149,17 +200,12 @@ class Visualizer:
         Returns:
             numpy.ndarray: Image with tracking info
         """
-        # Draw semi-transparent overlay
-        overlay = image.copy()
-        
         # Info panel
         panel_height = 120
-        cv2.rectangle(overlay, (0, 0), (image.shape[1], panel_height), 
-                     (0, 0, 0), -1)
         
-        # Blend
-        alpha = 0.6
-        image = cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0)
+        # Darken the panel rows in place instead of blending a full overlay
+        panel = image[:panel_height + 1]
+        cv2.LUT(panel, self._panel_lut, dst=panel)
         
         # Text info
         y_offset = 25
@@ -211,13 +257,15 @@ class Visualizer:
         
         if self.last_time is not None:
             fps = 1.0 / (current_time - self.last_time)
-            self.fps_values.append(fps)
             
-            # Keep last 30 values
-            if len(self.fps_values) > 30:
-                self.fps_values.pop(0)
+            # Replace the oldest of the last 30 values
+            self._fps_sum -= self._fps_values[self._fps_index]
+            self._fps_values[self._fps_index] = fps
+            self._fps_sum += fps
+            self._fps_index = (self._fps_index + 1) % len(self._fps_values)
+            self._fps_count = min(self._fps_count + 1, len(self._fps_values))
             
-            avg_fps = np.mean(self.fps_values)
+            avg_fps = self._fps_sum / self._fps_count
             
             # Draw FPS
             fps_text = f"FPS: {avg_fps:.1f}"
@@ -244,19 +292,21 @@ class Visualizer:
         diff_interp = cv2.resize(diff_frame, self.interpolation_size,
                                 interpolation=cv2.INTER_LINEAR)
         
-        # Normalize and colorize
+        # Normalize to 0-255
         diff_norm = cv2.normalize(diff_interp, None, 0, 255, cv2.NORM_MINMAX)
         diff_norm = diff_norm.astype(np.uint8)
-        diff_color = cv2.applyColorMap(diff_norm, cv2.COLORMAP_HOT)
         
-        # Stack horizontally
-        combined = np.hstack([frame_color, diff_color])
+        # Place both views side by side, colorizing the difference in place
+        width = frame_color.shape[1]
+        combined = np.empty((frame_color.shape[0], width + diff_norm.shape[1], 3),
+                            dtype=np.uint8)
+        combined[:, :width] = frame_color
+        self._colorize(diff_norm, self._diff_lut, dst=combined[:, width:])
         
         # Add labels
         cv2.putText(combined, "Current Frame", (10, 30),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(combined, "Difference", 
-                   (self.interpolation_size[0] + 10, 30),
+        cv2.putText(combined, "Difference", self._diff_label_org,
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         
         return combined
@@ -0,0 +1,51 @@
+"""
+Tests for the GridEye pixel decoding
+"""
+
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# The sensor module imports the Blinka hardware drivers at import time; the
+# decode under test needs none of them
+for _name in ('board', 'busio', 'adafruit_amg88xx'):
+    sys.modules.setdefault(_name, types.ModuleType(_name))
+
+from src.sensor.grideye_reader import _decode_pixels
+
+
+@pytest.mark.parametrize('word, celsius', [
+    (0x000, 0.0),
+    (0x001, 0.25),
+    (0x7FF, 511.75),
+    (0x800, -512.0),
+    (0xFFF, -0.25),
+])
+def test_decode_pixels_twos_complement(word, celsius):
+    words = np.full((8, 8), word, dtype=np.uint16)
+    scratch = np.empty((8, 8), dtype=np.int16)
+    out = np.empty((8, 8), dtype=np.float32)
+
+    _decode_pixels(words, scratch, out)
+
+    assert np.all(out == celsius)
+
+
+def test_decode_pixels_from_register_bytes():
+    # Little-endian register pairs, as read from 0x80 onwards
+    raw = bytearray(128)
+    raw[0:2] = (0x64, 0x00)  # 25.0 C
+    raw[2:4] = (0xFF, 0x0F)  # -0.25 C
+    words = np.frombuffer(raw, dtype='<u2').reshape(8, 8)
+    out = np.empty((8, 8), dtype=np.float32)
+
+    _decode_pixels(words, np.empty((8, 8), dtype=np.int16), out)
+
+    assert out[0, 0] == 25.0
+    assert out[0, 1] == -0.25
+    assert np.all(out.ravel()[2:] == 0.0)